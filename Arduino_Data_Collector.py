@@ -4,15 +4,17 @@ Python Script to print the serial output of an Arduino
 
 import serial
 import serial.tools.list_ports
-import pandas as pd
 import os
+import pathlib
+import queue
+import threading
 import time
 
 
 PORT = None
 BAUDRATE = None
 
-save_folder_path = os.path.expanduser("~") + "/Downloads/"
+save_folder_path = pathlib.Path.home() / 'Downloads'
 
 
 default_sample_count = 20
@@ -20,6 +22,20 @@ default_sample_count = 20
 # *********** Variables ***********
 
 delimiters = [';', '|', ':', ',']
+# table mapping every delimiter byte to a space in one pass
+delimiter_table = bytes.maketrans(
+    ''.join(delimiters).encode(),
+    b' ' * len(delimiters)
+)
+
+read_timeout = 0.05  # seconds to wait on the serial port before giving up
+# bytes kept while waiting for the end of a line, longer lines are dropped
+max_line_length = 1 << 16
+serial_buffer_size = 1 << 16  # bytes the OS may queue for the port
+queue_size = 1024  # lines read ahead of the data processing
+preview_length = 5  # samples kept in memory to show once collection ends
+write_buffer_size = 1 << 20  # bytes buffered before writing to the file
+line_ending = os.linesep.encode()  # same line ending pandas' to_csv used
 
 # *********** Function ***********
 
@@ -91,6 +107,7 @@ def get_port_and_baudrate(ports: list) -> tuple[str, int]:
         else:
             try:
                 baudrate = int(user)
+                break
             except Exception:
                 print('Baudrate must be an integer, try again.\n')
 
@@ -115,7 +132,18 @@ def test_connection(port: str, baudrate: int, close=True) -> serial.Serial:
 
     # try block to test connection to MCU
     try:
-        ser = serial.Serial(port=port, baudrate=baudrate)
+        ser = serial.Serial(
+            port=port,
+            baudrate=baudrate,
+            timeout=read_timeout,
+            write_timeout=read_timeout
+        )
+        # a larger OS queue (Windows only) keeps fast streams from overflowing
+        if hasattr(ser, 'set_buffer_size'):
+            ser.set_buffer_size(
+                rx_size=serial_buffer_size,
+                tx_size=serial_buffer_size
+            )
         print("Connection Succesful!\n")
         if close:
             ser.close()
@@ -128,6 +156,133 @@ def test_connection(port: str, baudrate: int, close=True) -> serial.Serial:
     return ser
 
 
+class LineReader:
+    '''
+    Class to read complete lines from the controller in batches.
+
+    Instead of reading one byte at a time until a newline, everything
+    waiting in the serial buffer is read at once and split into lines.
+    Delimiters are changed to spaces, lines are kept as bytes.
+    A line longer than max_line_length is dropped as a whole.
+
+        Parameters:
+            ser: Serial object of controller.
+    '''
+
+    def __init__(self, ser: serial.Serial):
+        self.ser = ser
+        self.buf = bytearray()
+        self.discarding = False  # dropping a too long line until its end
+
+    def readline(self) -> bytearray:
+        '''
+        Function to get the next complete line from the controller.
+
+            Parameters:
+                None
+
+            Returns:
+                bytearray, line without the line ending and with delimiters
+                changed to spaces, empty if no full line arrived before
+                the timeout.
+        '''
+
+        # reading all waiting bytes, bounded by the port timeout
+        end = self.buf.find(b'\n')
+        if end < 0:
+            start = len(self.buf)
+            self.buf += self.ser.read(max(1, self.ser.in_waiting))
+            end = self.buf.find(b'\n', start)
+
+        if end < 0:
+            # no full line yet, dropping a partial frame that is too long
+            if self.discarding or len(self.buf) > max_line_length:
+                self.buf.clear()
+                self.discarding = True
+            return bytearray()
+
+        if self.discarding:
+            # dropping the rest of the too long line, up to its line ending
+            del self.buf[:end+1]
+            self.discarding = False
+            return bytearray()
+
+        # changing delimiters and dropping "\r" in one pass
+        line = self.buf[:end].translate(delimiter_table, b'\r')
+
+        # removing the line in place so the same buffer is kept
+        del self.buf[:end+1]
+        return line
+
+
+def read_lines(reader: LineReader, lines: queue.Queue, stop: threading.Event):
+    '''
+    Function to read lines from the controller on a background thread,
+    so processing the data never holds up the serial port.
+
+        Parameters:
+            reader: LineReader of controller.
+            lines: queue to put complete lines on.
+            stop: event to stop reading.
+
+        Returns:
+            None, the thread ends early if the controller disconnects.
+    '''
+
+    # binding the methods called per line to local names
+    readline, put, stopped = reader.readline, lines.put, stop.is_set
+
+    try:
+        while not stopped():
+            line = readline()
+
+            # waiting for room on the queue unless collection stopped
+            while line and not stopped():
+                try:
+                    put(line, timeout=read_timeout)
+                    line = None
+                except queue.Full:
+                    pass
+
+    # in_waiting raises a plain OSError on POSIX after a disconnect
+    except (serial.SerialException, OSError):
+        pass
+
+
+def read_samples(lines: queue.Queue, reader_thread: threading.Thread):
+    '''
+    Function to split the lines read by the reader thread into samples.
+
+        Parameters:
+            lines: queue the reader thread puts lines on.
+            reader_thread: thread running read_lines.
+
+        Yields:
+            list of bytearray, values of one line, lines without values
+            are skipped.
+
+        Raises:
+            serial.SerialException: reader thread ended, MCU disconnected.
+    '''
+
+    # binding the methods called per line to local names
+    get_line, tokenize = lines.get, bytearray.split
+
+    while True:
+        try:
+            raw_data = get_line(timeout=read_timeout)
+        except queue.Empty:
+            # the reader thread only ends early on a disconnect
+            if not reader_thread.is_alive():
+                raise serial.SerialException('Arduino was disconnected.')
+            continue
+
+        # splitting data, delimiters are already spaces
+        raw_data = tokenize(raw_data)
+        if raw_data:
+            yield raw_data
+
+
 def get_collection_params() -> tuple:
     '''
     Function to get the user parameters for collecting data.
@@ -138,7 +293,7 @@ def get_collection_params() -> tuple:
         Returns tuple of:
             headers_printed: bool, does MCU print headers.
             max_count: int, how many samples to collect.
-            path: str, path to save data as.
+            path: pathlib.Path, path to save data as.
     '''
     print("Getting Collection Parameters:")
 
@@ -148,7 +303,7 @@ def get_collection_params() -> tuple:
     user = input(text).lower()
 
     headers_printed = False
-    if user in ['yes', 'y',]:
+    if user in ('y', 'yes'):
         headers_printed = True
     print()
 
@@ -181,32 +336,75 @@ def get_collection_params() -> tuple:
     if filename.lower() == 'skip':
         path = None
     else:
-        path = os.path.join(save_folder_path, f'{filename}.csv')
+        path = save_folder_path / f'{filename}.csv'
+
+        # reading the folder once instead of checking every candidate name
+        existing = set()
+        if save_folder_path.is_dir():
+            with os.scandir(save_folder_path) as entries:
+                existing = {entry.name for entry in entries}
 
         # loop to check if filename already exists, if so modify the name
-        base, ext = os.path.splitext(path)
+        base, ext = path.stem, path.suffix
         count = 1
-        while os.path.exists(path):
-            path = f'{base} ({count}){ext}'
+        while path.name in existing:
+            path = save_folder_path / f'{base} ({count}){ext}'
             count += 1
 
     return headers_printed, max_count, path
 
 
-def save_data(data: pd.DataFrame, path: str):
+def decode_values(values: list[bytearray]) -> list[str]:
+    '''
+    Function to decode the values of a sample into strings.
+
+        Parameters:
+            values: list of bytearray, values of one sample.
+
+        Returns:
+            list of str.
+    '''
+
+    return [value.decode(errors='replace') for value in values]
+
+
+def open_save_file(path: pathlib.Path, headers: list[str]):
+    '''
+    Function to open the CSV file, data is written to it as it is collected.
+
+        Parameters:
+            path: path to save the data, None if saving is skipped.
+            headers: column headers of the data.
+
+        Returns:
+            file opened in binary mode, None if saving is skipped.
+    '''
+    if not path:  # User skipped data saving.
+        return None
+
+    file = open(path, 'wb', buffering=write_buffer_size)
+    file.write(' '.join(headers).encode() + line_ending)
+
+    return file
+
+
+def save_data(file, path: pathlib.Path):
     '''
-    Function to save the collected data
+    Function to finish saving the collected data
 
         Parameters:
-            data: dataframe of collected data
+            file: opened save file, None if nothing was written.
             path: path to save the data.
 
         Returns:
             none
     '''
-    if path:  # User wants to save data.
-        data.to_csv(path, index=False, sep=' ')
-        print(f'Data saved as "{path}".')
+    if file:  # Data was written while collecting.
+        file.close()
+        print(f'\nData saved as "{path}".')
+
+    elif path:  # Collection stopped before the headers were read.
+        print('\nNo data was collected, nothing was saved.')
 
     else:  # User skipped data saving.
         print('\nSaving data was skipped.')
@@ -251,13 +449,32 @@ def main():
         port = PORT
         baudrate = BAUDRATE
 
-    ser = test_connection(port=port, baudrate=baudrate, close=True)
+    # asking for the parameters first so the port is only held while collecting
     headers_printed, max_count, path = get_collection_params()
-
-    ser.open()
+    ser = test_connection(port=port, baudrate=baudrate, close=False)
+    reader = LineReader(ser)
+
+    # reading the serial port on its own thread
+    lines = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    reader_thread = threading.Thread(
+        target=read_lines,
+        args=(reader, lines, stop),
+        daemon=True
+    )
+    reader_thread.start()
 
     # try-block to collect data
+    samples = read_samples(lines, reader_thread)
     count = 0  # data collected count
+    headers = []
+    preview = []  # first samples, the rest only go to the file
+    file = None
+    write_row = None
+
+    # only showing about 100 samples, printing every sample slows large runs
+    print_every = max(1, max_count // 100)
+    width = len(str(max_count))
 
     try:
         '''
@@ -272,56 +489,58 @@ def main():
         # collecting data
         print('\nStarting Data Collection:')
         start_time = time.time()
-        while count < max_count + 1:
 
-            # reading data from the MCU.
-            raw_data = ser.readline().decode().strip()
+        # the first line gives the headers, or the number of columns
+        raw_data = next(samples)
+        print(f'Count {count:>{width}}/{max_count}: {", ".join(decode_values(raw_data))}')
+
+        # checking if headers are included in data
+        if headers_printed:
+            headers = decode_values(raw_data)
+        else:
+            # creating default headers
+            headers = [f'Col{num}' for num in range(len(raw_data))]
+
+        file = open_save_file(path, headers)
+        if file:
+            write_row = file.write
 
-            # Changing delimiters
-            for delimiter in delimiters:
-                raw_data = raw_data.replace(delimiter, ' ')
-            raw_data = raw_data.split()  # splitting data
+        # range goes first so no extra sample is read after the last one
+        for count, raw_data in zip(range(1, max_count + 1), samples):
 
             # print statement to show data as it collected.
-            if max_count >= 1000:
-                print(f'Count {count:>3}/{max_count}: {raw_data}')
-            else:
-                print(f'Count {count:>2}/{max_count}: {raw_data}')
-
-            # Adding data to dataframe:
-            if count == 0:
-                # checking if headers are included in data
-                if headers_printed:
-                    headers = raw_data
-                else:
-                    # creating default headers
-                    headers = [f'Col{num}' for num in range(len(raw_data))]
-                dataframe = pd.DataFrame(columns=headers)
-                count = 1
-            else:
-                tmp_data = pd.DataFrame(raw_data).T
-                tmp_data.columns = headers
-                dataframe = pd.concat(
-                    [dataframe, tmp_data],
-                    ignore_index=True
-                )
-                count += 1
+            if count % print_every == 0 or count == max_count:
+                print(f'Count {count:>{width}}/{max_count}: {", ".join(decode_values(raw_data))}')
+
+            # Writing data to the file, still as bytes:
+            if write_row:
+                write_row(b' '.join(raw_data) + line_ending)
+            if count <= preview_length:
+                preview.append(decode_values(raw_data))
 
     except serial.SerialException:
         triggerd = '-> Arduino was disconnected.'
 
     except KeyboardInterrupt:  # user interrupt process.
-        ser.close()
         triggerd = "-> User stopped Program."
 
+    finally:
+        # stopping the reader thread before closing the port
+        stop.set()
+        reader_thread.join()
+        ser.close()
+
+        save_data(file=file, path=path)
+
     runtime = time.time() - start_time
     runtime = format_runtime(runtime)
 
+    # importing pandas only now, it is slow to import and only shows the sample
+    import pandas as pd
+
     # showing sample of data collected.
     print("\nSample of collected data:")
-    print(dataframe.head())
-
-    save_data(data=dataframe, path=path)
+    print(pd.DataFrame(preview, columns=headers))
 
     print("\nCollection Parameters:")
     if triggerd:
@@ -329,8 +548,11 @@ def main():
     else:
         print(f'Job Status: Succesful.')
     text = f'Serial Port: {port}, Baudrate: {baudrate}.\n'
-    text += f'Sample Count: {count-1}/{max_count}, Runtime: {runtime}\n'
-    text += f'Saved Filename: "{os.path.split(path)[-1]}"\n'
+    text += f'Sample Count: {count}/{max_count}, Runtime: {runtime}\n'
+    if path:
+        text += f'Saved Filename: "{path.name}"\n'
+    else:
+        text += 'Saved Filename: skipped\n'
     print(text)
 
 
@@ -4,13 +4,17 @@ Python Script to print serial outputs from an arduino
 
 import serial
 import serial.tools.list_ports
-import pandas as pd
-import os
+import sys
+import time
 
 # This variables can be set to skip the menu.
 PORT = None
 BAUDRATE = None
 
+read_timeout = 0.05  # seconds to wait on the serial port before giving up
+flush_interval = 0.1  # seconds between writing the output to the terminal
+serial_buffer_size = 1 << 16  # bytes the OS may queue for the port
+
 
 def get_available_ports() -> list[str]:
     '''
@@ -80,6 +84,7 @@ def get_port_and_baudrate(ports: list) -> tuple[str, int]:
         else:
             try:
                 baudrate = int(user)
+                break
             except Exception:
                 print('Baudrate must be an integer, try again.\n')
 
@@ -104,7 +109,18 @@ def test_connection(port: str, baudrate: int, close=True) -> serial.Serial:
 
     # try block to test connection to MCU
     try:
-        ser = serial.Serial(port=port, baudrate=baudrate)
+        ser = serial.Serial(
+            port=port,
+            baudrate=baudrate,
+            timeout=read_timeout,
+            write_timeout=read_timeout
+        )
+        # a larger OS queue (Windows only) keeps fast streams from overflowing
+        if hasattr(ser, 'set_buffer_size'):
+            ser.set_buffer_size(
+                rx_size=serial_buffer_size,
+                tx_size=serial_buffer_size
+            )
         print("Connection Succesful!")
         if close:
             ser.close()
@@ -117,20 +133,6 @@ def test_connection(port: str, baudrate: int, close=True) -> serial.Serial:
     return ser
 
 
-def get_serial_output(ser: serial.Serial) -> str:
-    '''
-    Function to get the serial output of the controller.
-
-        Parameters:
-            ser: Serial object of controller
-
-        Returns:
-            str
-    '''
-
-    return ser.readline().decode().strip()
-
-
 def main():
     '''
     Main Function
@@ -144,22 +146,34 @@ def main():
         port = PORT
         baudrate = BAUDRATE
 
-    # testing connection with given port and baudrate
-    ser = test_connection(port, baudrate)
+    # testing connection with given port and baudrate, keeping it open
+    ser = test_connection(port, baudrate, close=False)
 
     # Starting Serial outputs
-    print('Starting Serial Prints:\n')
-    ser.open()
+    print('Starting Serial Prints:\n', flush=True)
+
+    # passing the raw output through, flushing when idle or every interval
+    output = sys.stdout.buffer
+    read, write, flush = ser.read, output.write, output.flush
+    flushed = time.monotonic()
     while (True):
         try:
-            # getting
-            output = get_serial_output(ser)
-            print(output)
-
-        except serial.SerialException:
+            # getting everything waiting, bounded by the port timeout
+            chunk = read(max(1, ser.in_waiting))
+            write(chunk)
+
+            now = time.monotonic()
+            if not chunk or now - flushed >= flush_interval:
+                flush()
+                flushed = now
+
+        # in_waiting raises a plain OSError on POSIX after a disconnect
+        except (serial.SerialException, OSError):
+            flush()
             exit('\nMicrocontroller was disconnected.')
 
         except KeyboardInterrupt:
+            flush()
             exit('\nUser force quit Program.')
 
 